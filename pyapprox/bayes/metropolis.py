@@ -1,6 +1,6 @@
 import numpy as np
 # from tqdm import tqdm
-from scipy.linalg import solve_triangular
+from scipy.linalg import solve_triangular, cho_solve
 from scipy.optimize import (
     minimize, differential_evolution)
 import matplotlib.pyplot as plt
@@ -577,6 +577,8 @@ class GaussianLogLike(object):
         self.data = data
         assert self.data.ndim == 1
         self.ndata = data.shape[0]
+        # the cholesky factor is only computed for dense covariances
+        self._noise_covar_chol = None
         self.noise_covar_inv, self.log_noise_covar_det = (
             self.noise_covariance_inverse(noise_covar))
 
@@ -588,8 +590,15 @@ class GaussianLogLike(object):
             return 1/noise_covar, np.log(np.prod(noise_covar))
         elif noise_covar.ndim == 2:
             assert noise_covar.shape == (self.ndata, self.ndata)
-            return np.linalg.inv(noise_covar), np.log(
-                np.linalg.det(noise_covar))
+            diag = np.diag(noise_covar)
+            if np.count_nonzero(noise_covar - np.diag(diag)) == 0:
+                # use elementwise operations for diagonal covariances
+                return self.noise_covariance_inverse(diag.copy())
+            self._noise_covar_chol = np.linalg.cholesky(noise_covar)
+            return (
+                cho_solve((self._noise_covar_chol, True),
+                          np.eye(self.ndata)),
+                2*np.log(np.diag(self._noise_covar_chol)).sum())
         raise ValueError("noise_covar has the wrong shape")
 
     # def noise_covariance_determinant(self, noise_covar):
@@ -609,18 +618,13 @@ class GaussianLogLike(object):
         model_vals = self.model(samples)
         assert model_vals.ndim == 2
         assert model_vals.shape[1] == self.ndata
-        vals = np.empty((nsamples, 1))
-        for ii in range(nsamples):
-            residual = self.data - model_vals[ii, :]
-            if np.isscalar(self.noise_covar_inv):
-                tmp = self.noise_covar_inv*residual
-            elif self.noise_covar_inv.ndim == 1:
-                tmp = self.noise_covar_inv[:, None]*residual
-                # vals[ii] = (residual.T*self.noise_covar_inv).dot(residual)
-            else:
-                tmp = self.noise_covar_inv.dot(residual)
-                # vals[ii] = residual.T.dot(self.noise_covar_inv).dot(residual)
-            vals[ii] = residual.dot(tmp)
+        residuals = self.data[None, :] - model_vals
+        if self._noise_covar_chol is None:
+            tmp = self.noise_covar_inv*residuals
+        else:
+            # solve for all samples at once using the stored factorization
+            tmp = cho_solve((self._noise_covar_chol, True), residuals.T).T
+        vals = np.sum(residuals*tmp, axis=1)[:, None]
         vals += self.ndata*np.log(2*np.pi) + self.log_noise_covar_det
         vals *= -0.5
         vals = np.atleast_2d(vals)
@@ -631,7 +635,7 @@ class GaussianLogLike(object):
             raise ValueError("nsamples must be 1 when return_grad is True")
         if self.model_jac is None:
             raise ValueError("model_jac is none but gradient requested")
-        grad = tmp.dot(self.model_jac(samples))
+        grad = tmp[0].dot(self.model_jac(samples))
         return vals, grad
 
 
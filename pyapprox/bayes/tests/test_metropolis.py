@@ -7,7 +7,8 @@ from pyapprox.variables.joint import IndependentMarginalsVariable
 from pyapprox.bayes.laplace import (
     laplace_posterior_approximation_for_linear_models, laplace_evidence)
 from pyapprox.bayes.metropolis import (
-    MetropolisMCMCVariable, compute_mvn_cholesky_based_data, mvn_log_pdf)
+    MetropolisMCMCVariable, compute_mvn_cholesky_based_data, mvn_log_pdf,
+    GaussianLogLike)
 from pyapprox.surrogates.interp.monomial import (
     univariate_monomial_basis_matrix)
 from pyapprox.util.utilities import (
@@ -220,6 +221,42 @@ class TestMetropolis(unittest.TestCase):
         for test_case in test_cases[-1:]:
             self._check_mcmc_variable(*test_case)
 
+    def _check_gaussian_loglike(self, noise_covar):
+        nvars, nobs, nsamples = 3, noise_covar.shape[0], 4
+        Amatrix = np.random.normal(0, 1, (nobs, nvars))
+        data = np.random.normal(0, 1, (nobs))
+
+        def model(x):
+            return Amatrix.dot(x).T
+
+        loglike = GaussianLogLike(
+            model, data, noise_covar, model_jac=lambda x: Amatrix)
+        samples = np.random.normal(0, 1, (nvars, nsamples))
+        pred_obs = model(samples)
+        assert np.allclose(
+            loglike(samples)[:, 0],
+            [stats.multivariate_normal(pred_obs[ii], noise_covar).logpdf(data)
+             for ii in range(nsamples)])
+
+        errors = check_gradients(
+            partial(loglike, return_grad=True), True, samples[:, :1],
+            disp=False)
+        assert errors.min()/errors.max() < 1e-6
+        return loglike
+
+    def test_gaussian_loglike(self):
+        nobs = 5
+        noise_covar = np.random.normal(0, 1, (nobs, nobs))
+        noise_covar = noise_covar.T.dot(noise_covar)+np.eye(nobs)
+        loglike = self._check_gaussian_loglike(noise_covar)
+        assert loglike._noise_covar_chol is not None
+
+        # dense diagonal covariances are stored by their diagonal
+        loglike = self._check_gaussian_loglike(
+            np.diag(np.full((nobs,), 0.3)))
+        assert loglike._noise_covar_chol is None
+        assert loglike.noise_covar_inv.shape == (nobs,)
+
 
 if __name__ == '__main__':
     metropolis_test_suite = unittest.TestLoader().loadTestsFromTestCase(
@@ -3,6 +3,7 @@ from functools import partial
 
 import numpy as np
 from scipy import stats
+from scipy.linalg.blas import dsyrk
 
 from pyapprox.surrogates.integrate import integrate
 from pyapprox.variables.joint import IndependentMarginalsVariable
@@ -10,6 +11,21 @@ from pyapprox.surrogates.orthopoly.quadrature import gauss_jacobi_pts_wts_1D
 from pyapprox.interface.wrappers import ModelEnsemble
 
 
+def _unit_gauss_legendre_rule(nsamples):
+    # Gauss-Legendre rule for the uniform probability measure on [0, 1]
+    quad_x, quad_w = gauss_jacobi_pts_wts_1D(nsamples, 0, 0)
+    quad_x, quad_w = (quad_x[None, :]+1)/2, quad_w[:, None].copy()
+    # the rule is shared by all instances so prevent in-place changes
+    quad_x.flags.writeable = False
+    quad_w.flags.writeable = False
+    return quad_x, quad_w
+
+
+# the same rule used by the default tensor-product quadrature at level 10,
+# which integrates the products of the polynomial ensemble exactly
+_UNIT_GAUSS_LEGENDRE_RULE = _unit_gauss_legendre_rule(11)
+
+
 class ACVBenchmark(ABC):
     def __init__(self, *args, **kwargs):
         self.variable = self._set_variable(*args, **kwargs)
@@ -19,6 +35,9 @@ class ACVBenchmark(ABC):
         self._quadrature_rule = self._set_quadrature_rule(*args, **kwargs)
         self._flat_funs = self._flatten_funs()
         self._model_ensemble = ModelEnsemble(self.funs)
+        # the moments only depend on the fixed benchmark definition so are
+        # computed at most once
+        self._means, self._cov = None, None
 
     @abstractmethod
     def _set_funs(self):
@@ -42,11 +61,15 @@ class ACVBenchmark(ABC):
                     partial(self._flat_fun_wrapper, ii, jj))
         return flat_funs
 
+    def _evaluate_funs(self, xx):
+        # columns are ordered the same as self._flat_funs
+        return np.hstack([fun(xx) for fun in self.funs])
+
     def _get_means(self) -> np.ndarray:
         # overide this function if you know the means exactly
         quad_xx, quad_ww = self._quadrature_rule
-        means = [f(quad_xx).dot(quad_ww) for f in self._flat_funs]
-        return np.array(means).reshape(self.nmodels, self.nqoi)
+        means = quad_ww.ravel().dot(self._evaluate_funs(quad_xx))
+        return means.reshape(self.nmodels, self.nqoi)
 
     def get_means(self) -> np.ndarray:
         """
@@ -57,27 +80,31 @@ class ACVBenchmark(ABC):
         means : np.ndarray(nmodels, nqoi)
             The means of each model
         """
-        means = self._get_means()
-        if (means.ndim != 2 or means.shape[0] != self.nmodels or
-                means.shape[1] != self.nqoi):
-            raise RuntimeError("_get_means() not implemented correctly")
-        return means
+        if self._means is None:
+            means = self._get_means()
+            if (means.ndim != 2 or means.shape[0] != self.nmodels or
+                    means.shape[1] != self.nqoi):
+                raise RuntimeError("_get_means() not implemented correctly")
+            self._means = means
+        return self._means.copy()
 
     def _get_covariance_matrix(self) -> np.ndarray:
         # overide this function if you know the means exactly
         quad_xx, quad_ww = self._quadrature_rule
-        means = [f(quad_xx).dot(quad_ww) for f in self._flat_funs]
-
-        cov = np.empty((self.nmodels*self.nqoi, self.nmodels*self.nqoi))
-        ii = 0
-        for fi, mi in zip(self._flat_funs, means):
-            jj = 0
-            for fj, mj in zip(self._flat_funs, means):
-                cov[ii, jj] = (
-                    (fi(quad_xx)-mi)*(fj(quad_xx)-mj)).dot(quad_ww).item()
-                jj += 1
-            ii += 1
-        return cov
+        quad_ww = quad_ww.ravel()
+        # evaluate each model once and reuse the centered values
+        # for every entry of the covariance
+        centered_vals = self._evaluate_funs(quad_xx)
+        centered_vals -= quad_ww.dot(centered_vals)
+        if np.any(quad_ww < 0):
+            # e.g. sparse grids can have negative weights
+            return centered_vals.T.dot(centered_vals*quad_ww[:, None])
+        # scale in place and use a symmetric rank-k update which only
+        # computes the upper triangle. The transpose is Fortran ordered so
+        # is not copied by dsyrk
+        centered_vals *= np.sqrt(quad_ww)[:, None]
+        cov = dsyrk(1.0, centered_vals.T)
+        return cov+np.triu(cov, 1).T
 
     def get_covariance_matrix(self) -> np.ndarray:
         """
@@ -89,12 +116,14 @@ class ACVBenchmark(ABC):
             The covariance treating functions concatinating the qoi
             of each model f0, f1, f2
         """
-        cov = self._get_covariance_matrix()
-        if (cov.ndim != 2 or cov.shape[0] != self.nmodels*self.nqoi or
-                cov.shape[1] != self.nmodels*self.nqoi):
-            raise RuntimeError(
-                "_get_covariance_matrix() not implemented correctly")
-        return cov
+        if self._cov is None:
+            cov = self._get_covariance_matrix()
+            if (cov.ndim != 2 or cov.shape[0] != self.nmodels*self.nqoi or
+                    cov.shape[1] != self.nmodels*self.nqoi):
+                raise RuntimeError(
+                    "_get_covariance_matrix() not implemented correctly")
+            self._cov = cov
+        return self._cov.copy()
 
     def _V_fun_entry(self, jj, kk, ll, means, flat_covs, xx):
         idx1 = jj*self.nqoi + kk
@@ -214,6 +243,14 @@ class PolynomialModelEnsemble(ACVBenchmark):
         return 1/np.arange(6, 1, -1)[:self.nmodels].reshape(
             self.nmodels, self.nqoi)
 
+    def _set_quadrature_rule(self, *args, **kwargs):
+        return _UNIT_GAUSS_LEGENDRE_RULE
+
+    def _evaluate_funs(self, xx):
+        # the columns of the vandermonde matrix are x**5, x**4, ..., 1
+        # and are computed by repeated multiplication instead of pow
+        return np.vander(xx[0], 6)[:, :self.nmodels]
+
     def _set_variable(self, nmodels):
         univariate_variables = [stats.uniform(0, 1)]
         return IndependentMarginalsVariable(
@@ -395,31 +432,57 @@ class ShortColumnModelEnsemble(ACVBenchmark):
             Y = np.exp(Y)
         return b, h, P, M, Y
 
-    def m0(self, samples):
+    def _shared_terms(self, samples):
+        # subexpressions common to all models. Only b and M are also
+        # needed on their own
         b, h, P, M, Y = self._extract_variables(samples)
-        return (1 - 4*M/(b*(h**2)*Y) - (P/(b*h*Y))**2)[:, None]
+        inv_bhY = 1/(b*h*Y)
+        return b, M, P*inv_bhY, M*inv_bhY/h
+
+    @staticmethod
+    def _model_values(ii, b, M, P_bhY, M_bh2Y):
+        # P_bhY = P/(b*h*Y) and M_bh2Y = M/(b*h**2*Y)
+        if ii == 0:
+            return 1 - 4*M_bh2Y - P_bhY**2
+        if ii == 1:
+            return 1 - 3.8*M_bh2Y - (P_bhY*(1 + (M-2000)/4000))**2
+        if ii == 2:
+            return 1 - M_bh2Y - P_bhY**2
+        if ii == 3:
+            return 1 - M_bh2Y - (P_bhY*(1 + M))**2
+        if ii == 4:
+            # P*(1+M)/(h*Y) = b*(1+M)*P/(b*h*Y)
+            return 1 - M_bh2Y - (P_bhY*b*(1 + M))**2
+        raise ValueError(f"model {ii} does not exist")
+
+    def m0(self, samples):
+        return self._model_values(0, *self._shared_terms(samples))[:, None]
 
     def m1(self, samples):
-        b, h, P, M, Y = self._extract_variables(samples)
-        return (1 - 3.8*M/(b*(h**2)*Y) - (
-            (P*(1 + (M-2000)/4000))/(b*h*Y))**2)[:, None]
+        return self._model_values(1, *self._shared_terms(samples))[:, None]
 
     def m2(self, samples):
-        b, h, P, M, Y = self._extract_variables(samples)
-        return (1 - M/(b*(h**2)*Y) - (P/(b*h*Y))**2)[:, None]
+        return self._model_values(2, *self._shared_terms(samples))[:, None]
 
     def m3(self, samples):
-        b, h, P, M, Y = self._extract_variables(samples)
-        return (1 - M/(b*(h**2)*Y) - (P*(1 + M)/(b*h*Y))**2)[:, None]
+        return self._model_values(3, *self._shared_terms(samples))[:, None]
 
     def m4(self, samples):
-        b, h, P, M, Y = self._extract_variables(samples)
-        return (1 - M/(b*(h**2)*Y) - (P*(1 + M)/(h*Y))**2)[:, None]
+        return self._model_values(4, *self._shared_terms(samples))[:, None]
 
     def _set_funs(self, nmodels):
         self._apply_lognormal = False
         return [self.m0, self.m1, self.m2, self.m3, self.m4][:nmodels], 1
 
+    def _evaluate_funs(self, xx):
+        # evaluate all models together so the subexpressions they share
+        # are only computed once
+        shared_terms = self._shared_terms(xx)
+        vals = np.empty((xx.shape[1], self.nmodels))
+        for ii in range(self.nmodels):
+            vals[:, ii] = self._model_values(ii, *shared_terms)
+        return vals
+
     def _set_variable(self, nmodels):
         univariate_variables = [
             stats.uniform(5, 10), stats.uniform(15, 10), stats.norm(500, 100),
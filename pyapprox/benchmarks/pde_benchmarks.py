@@ -215,8 +215,10 @@ class AdvectionDiffusionReactionKLEModel():
         qoi = self._functional(sol, sample_copy).numpy()
         if not return_grad:
             return qoi
+        # reuse the forward solution instead of solving the PDE again
         grad = self._adj_solver.compute_gradient(
-            lambda r, p: None, sample_copy, **self._newton_kwargs)
+            lambda r, p: None, sample_copy, fwd_sol=sol,
+            **self._newton_kwargs)
         return qoi, grad.detach().numpy().squeeze()
 
     def __call__(self, samples, return_grad=False):
@@ -119,7 +119,12 @@ class TestPDEBenchmarks(unittest.TestCase):
         nvars = 5
 
         # config_values = [2*np.arange(1, 11), 2*np.arange(1, 11)]
-        config_values = [2*np.arange(1, 16), 2*np.arange(1, 16)]
+        # config_values = [2*np.arange(1, 16), 2*np.arange(1, 16)]
+        # the checks below only depend on the coarsest and the second finest
+        # configurations (relative to the finest) so skip the intermediate
+        # configurations which are expensive to solve
+        levels = np.array([1, 2, 4, 8, 14, 15])
+        config_values = [2*levels, 2*levels]
         benchmark = setup_benchmark(
             "multi_index_advection_diffusion", kle_nvars=nvars,
             kle_length_scale=length_scale, kle_stdev=sigma,
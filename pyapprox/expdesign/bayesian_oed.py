@@ -267,6 +267,93 @@ def compute_weighted_sqeuclidian_distance(obs, pred_obs, noise_std,
     return sq_dists
 
 
+@njit(cache=True)
+def sq_dists_numba_2d(XX, YY, a, b, active_indices):
+    """
+    Compute the weighted squared l2-norm distance between paired samples
+    restricted to a subset of the entries. E.g. for the ii-th pair
+
+    b + sum_k a[k]*(XX[ii, k]-YY[ii, k])**2
+
+    where the sum is over k in active_indices
+
+    Parameters
+    ----------
+    XX : np.ndarray (LL, NN)
+        The first set of samples
+
+    YY : np.ndarray (LL, NN)
+        The second set of samples
+
+    a : np.ndarray (NN)
+        The weight of each squared difference
+
+    b : float
+        scalar added to the weighted distance
+
+    active_indices : np.ndarray (NACTIVE)
+        The integer indices of the entries included in the sum
+
+    Returns
+    -------
+    ss : np.ndarray (LL)
+        The scaled distances
+    """
+    nsamples = XX.shape[0]
+    ss = np.empty(nsamples)
+    nactive_indices = active_indices.shape[0]
+    for ii in range(nsamples):
+        ss[ii] = b
+        for kk in range(nactive_indices):
+            ss[ii] += a[active_indices[kk]]*(
+                XX[ii, active_indices[kk]] - YY[ii, active_indices[kk]])**2
+    return ss
+
+
+def gaussian_loglike_fun_paired_2D(
+        obs, pred_obs, noise_std, active_indices=None):
+    """
+    Compute the log-likelihood values for pairs of real and predicted
+    observations without allocating the temporary arrays needed by
+    :func:`gaussian_loglike_fun_broadcast`
+
+    Parameters
+    ----------
+    obs : np.ndarray (nsamples, nobs)
+        The real observations for each sample
+
+    pred_obs : np.ndarray (nsamples, nobs)
+        The observations predicited by the model for a set of samples
+
+    noise_std : float or np.ndarray (nobs, 1)
+        The standard deviation of Gaussian noise added to each observation
+
+    active_indices : np.ndarray (nobs, 1)
+        The subset of indices of the observations used to compute the
+        likelihood
+
+    Returns
+    -------
+    llike : np.ndaray (nsamples, 1)
+    """
+    if obs.ndim != 2 or obs.shape != pred_obs.shape:
+        raise ValueError("obs and pred_obs must be 2D arrays with same shape")
+    if (type(noise_std) == np.ndarray and
+            noise_std.shape[0] != obs.shape[-1]):
+        raise ValueError("noise_std must be provided for each observation")
+    if type(noise_std) != np.ndarray:
+        noise_std = np.ones((obs.shape[1], 1), dtype=float)*noise_std
+    if active_indices is None:
+        active_indices = np.arange(obs.shape[1])
+    active_indices = np.asarray(active_indices, dtype=np.int64)
+    tmp1 = -1/(2*noise_std[:, 0].astype(float)**2)
+    tmp2 = 0.5*np.sum(np.log(-tmp1[active_indices]/np.pi))
+    llike = sq_dists_numba_2d(
+        np.asarray(obs, dtype=float), np.asarray(pred_obs, dtype=float),
+        tmp1, tmp2, active_indices)
+    return llike[:, None]
+
+
 def gaussian_loglike_fun_economial_2D(
         obs, pred_obs, noise_std, active_indices=None):
     if type(noise_std) != np.ndarray:
@@ -294,6 +381,9 @@ def gaussian_loglike_fun(obs, pred_obs, noise_std, active_indices=None):
     elif obs.ndim == 2 and pred_obs.ndim == 2 and obs.shape != pred_obs.shape:
         return gaussian_loglike_fun_economial_2D(
             obs, pred_obs, noise_std, active_indices)
+    elif obs.ndim == 2 and pred_obs.ndim == 2:
+        return gaussian_loglike_fun_paired_2D(
+            obs, pred_obs, noise_std, active_indices)
     else:
         return gaussian_loglike_fun_broadcast(
             obs, pred_obs, noise_std, active_indices)
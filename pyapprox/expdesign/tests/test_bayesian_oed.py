@@ -5,6 +5,9 @@ from scipy import stats
 from functools import partial
 from scipy.special import erfinv
 import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 
 from pyapprox.expdesign.bayesian_oed import (
     gaussian_loglike_fun, d_optimal_utility, oed_variance_deviation,
@@ -28,12 +31,7 @@ from pyapprox.variables.tests.test_risk_measures import (
     get_lognormal_example_exact_quantities
 )
 from pyapprox.bayes.laplace import laplace_evidence
-from pyapprox.variables.transforms import (
-    AffineTransform
-)
-from pyapprox.util.utilities import (
-    cartesian_product, outer_product
-)
+from pyapprox.util.utilities import cartesian_product
 from pyapprox.surrogates.interp.tensorprod import (
     piecewise_univariate_linear_quad_rule)
 from pyapprox.variables.algebra import (
@@ -498,6 +496,18 @@ def conditional_lognormal_kl_pred_stat(
     return kl_div
 
 
+def _single_pass_std(vals):
+    """
+    Compute the standard deviation of each row of vals using E[X^2]-E[X]^2
+    which reads vals once per moment instead of the two dependent passes
+    used by np.std.
+    """
+    nsamples = vals.shape[1]
+    mean = vals.sum(axis=1)/nsamples
+    second_moment = np.einsum("ij,ij->i", vals, vals)/nsamples
+    return np.sqrt(second_moment-mean**2)
+
+
 def linear_obs_fun(Amat, samples):
     """
     Linear model. Fix some unknowns
@@ -514,120 +524,166 @@ def exponential_qoi_fun(samples):
     return np.exp(samples.sum(axis=0))[:, None]
 
 
-class TestBayesianOED(unittest.TestCase):
+def tensor_product_grid(samples_1d, nvars):
+    # np.meshgrid avoids building the grid one point at a time in python.
+    # Reverse the grids so that the first variable varies fastest, which
+    # matches the ordering of cartesian_product
+    grids = np.meshgrid(*([samples_1d]*nvars), indexing="ij")[::-1]
+    return np.stack([grid.ravel() for grid in grids], axis=0)
 
-    def setUp(self):
-        np.random.seed(1)
 
-    def _check_loglike_fun(self, noise_std, active_indices, design=None,
-                           degree=1):
+def check_loglike_fun(noise_std, active_indices, design=None, degree=1,
+                      seed=None):
+    if seed is not None:
+        np.random.seed(seed)
 
-        nvars = degree+1
-        if design is None:
-            design = np.linspace(-1, 1, 4)[None, :]
+    nvars = degree+1
+    if design is None:
+        design = np.linspace(-1, 1, 4)[None, :]
 
-        obs_matrix = design.T**(np.arange(degree+1)[None, :])
+    obs_matrix = np.vander(design[0], degree+1, increasing=True)
+    # store the transpose so each call does not need to transpose
+    # the (potentially large) result
+    obs_matrix_T = np.ascontiguousarray(obs_matrix.T)
 
-        def fun(design, samples):
-            assert design.ndim == 2
-            assert samples.ndim == 2
-            return obs_matrix.dot(samples).T
+    def fun(design, samples):
+        assert design.ndim == 2
+        assert samples.ndim == 2
+        return samples.T.dot(obs_matrix_T)
 
-        prior_mean = np.zeros((nvars, 1))
-        prior_cov = np.eye(nvars)
+    prior_mean = np.zeros((nvars, 1))
+    prior_cov = np.eye(nvars)
 
-        true_sample = np.ones((nvars, 1))*0.4
-        obs = fun(design, true_sample)
+    true_sample = np.ones((nvars, 1))*0.4
+    obs = fun(design, true_sample)
 
-        if type(noise_std) == np.ndarray:
-            assert noise_std.shape[0] == obs.shape[1] and noise_std.ndim == 2
-            obs += np.random.normal(0, 1, obs.shape)*noise_std.T
-        else:
-            obs += np.random.normal(0, 1, obs.shape)*noise_std
+    if type(noise_std) == np.ndarray:
+        assert noise_std.shape[0] == obs.shape[1] and noise_std.ndim == 2
+        obs += np.random.normal(0, 1, obs.shape)*noise_std.T
+    else:
+        obs += np.random.normal(0, 1, obs.shape)*noise_std
 
-        noise_cov_inv = np.eye(obs.shape[1])/(noise_std**2)
+    noise_cov_inv = np.eye(obs.shape[1])/(noise_std**2)
 
-        if active_indices is None:
-            exact_post_mean, exact_post_cov = \
-                laplace_posterior_approximation_for_linear_models(
-                    obs_matrix, prior_mean, np.linalg.inv(prior_cov),
-                    noise_cov_inv, obs.T)
-        else:
-            exact_post_mean, exact_post_cov = \
-                laplace_posterior_approximation_for_linear_models(
-                    obs_matrix[active_indices, :], prior_mean,
-                    np.linalg.inv(prior_cov),
-                    extract_independent_noise_cov(
-                        noise_cov_inv, active_indices),
-                    obs[:, active_indices].T)
+    if active_indices is None:
+        exact_post_mean, exact_post_cov = \
+            laplace_posterior_approximation_for_linear_models(
+                obs_matrix, prior_mean, np.linalg.inv(prior_cov),
+                noise_cov_inv, obs.T)
+    else:
+        exact_post_mean, exact_post_cov = \
+            laplace_posterior_approximation_for_linear_models(
+                obs_matrix[active_indices, :], prior_mean,
+                np.linalg.inv(prior_cov),
+                extract_independent_noise_cov(
+                    noise_cov_inv, active_indices),
+                obs[:, active_indices].T)
+
+    n_xx = 100
+    lb, ub = stats.norm(0, 1).interval(0.99)
+    xx = tensor_product_grid(np.linspace(lb, ub, n_xx), nvars)
+    # compare the posterior densities in log-space to avoid exponentiating
+    # the values on the grid
+    true_post_logpdf_vals = stats.multivariate_normal(
+        exact_post_mean[:, 0], cov=exact_post_cov).logpdf(xx.T)[:, None]
+
+    # the prior is an independent standard normal so evaluate its density
+    # directly rather than constructing a frozen scipy distribution
+    # each time the prior is evaluated
+    def prior_logpdf(x):
+        return (-0.5*((x-prior_mean)**2).sum(axis=0) -
+                nvars/2*np.log(2*np.pi))[:, None]
+
+    def prior_pdf(x):
+        return np.exp(prior_logpdf(x))
+    pred_obs = fun(design, xx)
+    log_lvals = (
+        gaussian_loglike_fun(obs, pred_obs, noise_std, active_indices) +
+        prior_logpdf(xx))
+    assert log_lvals.shape == (xx.shape[1], 1)
+
+    xx_gauss, ww_gauss = gauss_hermite_pts_wts_1D(400)
+    xx_gauss = tensor_product_grid(xx_gauss, nvars)
+    ww_gauss = tensor_product_grid(ww_gauss, nvars).prod(axis=0)
+    pred_obs = fun(design, xx_gauss)
+    loglike_vals = gaussian_loglike_fun(
+        obs, pred_obs, noise_std, active_indices)[:, 0]
+    like_vals = np.exp(loglike_vals)
+    evidence = like_vals.dot(ww_gauss)
+    post_logpdf_vals = log_lvals-np.log(evidence)
+
+    post_cov = np.cov(
+        xx_gauss, aweights=ww_gauss*like_vals, ddof=0)
+    # print((post_cov, exact_post_cov))
+    assert np.allclose(post_cov, exact_post_cov)
+
+    gauss_evidence = laplace_evidence(
+        lambda x: np.exp(gaussian_loglike_fun(
+            obs, fun(design, x), noise_std, active_indices)[:, 0]),
+        prior_pdf, exact_post_cov, exact_post_mean)
+    # print(evidence, gauss_evidence)
+    assert np.allclose(evidence, gauss_evidence)
+
+    # accuracy depends on quadrature rule and size of noise
+    # print(post_logpdf_vals - true_post_logpdf_vals)
+    assert np.allclose(post_logpdf_vals, true_post_logpdf_vals, atol=1e-5)
+
+    # plt.plot(xx, np.exp(true_post_logpdf_vals))
+    # plt.plot(xx, prior_pdf(xx))
+    # plt.plot(xx, np.exp(post_logpdf_vals), '--')
+    # plt.show()
+
+
+def run_loglike_fun_checks(check_args):
+    """
+    Run check_loglike_fun for each tuple of arguments in check_args.
 
-        n_xx = 100
-        lb, ub = stats.norm(0, 1).interval(0.99)
-        xx = cartesian_product([np.linspace(lb, ub, n_xx)]*nvars)
-        true_pdf_vals = stats.multivariate_normal(
-            exact_post_mean[:, 0], cov=exact_post_cov).pdf(xx.T)[:, None]
-
-        def prior_pdf(x):
-            return np.atleast_1d(stats.multivariate_normal(
-                prior_mean[:, 0], cov=prior_cov).pdf(x.T))[:, None]
-        pred_obs = fun(design, xx)
-        lvals = (np.exp(
-            gaussian_loglike_fun(obs, pred_obs, noise_std, active_indices)) *
-                 prior_pdf(xx))
-        assert lvals.shape == (xx.shape[1], 1)
-
-        xx_gauss, ww_gauss = gauss_hermite_pts_wts_1D(400)
-        xx_gauss = cartesian_product([xx_gauss]*nvars)
-        ww_gauss = outer_product([ww_gauss]*nvars)
-        pred_obs = fun(design, xx_gauss)
-        loglike_vals = gaussian_loglike_fun(
-            obs, pred_obs, noise_std, active_indices)[:, 0]
-        evidence = np.exp(loglike_vals).dot(ww_gauss)
-        post_pdf_vals = lvals/evidence
-
-        post_cov = np.cov(
-            xx_gauss, aweights=ww_gauss*np.exp(loglike_vals), ddof=0)
-        # print((post_cov, exact_post_cov))
-        assert np.allclose(post_cov, exact_post_cov)
-
-        gauss_evidence = laplace_evidence(
-            lambda x: np.exp(gaussian_loglike_fun(
-                obs, fun(design, x), noise_std, active_indices)[:, 0]),
-            prior_pdf, exact_post_cov, exact_post_mean)
-        # print(evidence, gauss_evidence)
-        assert np.allclose(evidence, gauss_evidence)
-
-        # accuracy depends on quadrature rule and size of noise
-        # print(post_pdf_vals - true_pdf_vals)
-        assert np.allclose(post_pdf_vals, true_pdf_vals)
-
-        # plt.plot(xx, true_pdf_vals)
-        # plt.plot(xx, prior_pdf(xx))
-        # plt.plot(xx, post_pdf_vals, '--')
-        # plt.show()
+    The checks are independent so they are run in separate processes if the
+    environment variable PYAPPROX_TEST_MAX_WORKERS is set to a value greater
+    than one. Checks are run sequentially by default because the cost of
+    spawning processes exceeds the cost of a check on machines with few
+    cores.
+    """
+    max_workers = int(os.environ.get("PYAPPROX_TEST_MAX_WORKERS", 1))
+    if max_workers <= 1:
+        for args in check_args:
+            check_loglike_fun(*args)
+        return
+
+    with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(check_args)),
+            mp_context=get_context("spawn")) as executor:
+        futures = [executor.submit(check_loglike_fun, *args)
+                   for args in check_args]
+        for future in futures:
+            # re-raise any assertion errors raised in the workers
+            future.result()
 
-    def test_gaussian_loglike_fun(self):
-        np.random.seed(1)
-        self._check_loglike_fun(0.3, None)
-        np.random.seed(1)
-        self._check_loglike_fun(np.array([[0.25, 0.3, 0.35, 0.4]]).T, None)
-        active_indices = np.array([0, 1, 2, 3])
-        np.random.seed(1)
-        self._check_loglike_fun(0.3, active_indices)
-        np.random.seed(1)
-        self._check_loglike_fun(
-            np.array([[0.25, 0.3, 0.35, 0.4]]).T, active_indices)
-        active_indices = np.array([0, 2, 3])
-        np.random.seed(1)
-        self._check_loglike_fun(0.3, active_indices)
-        np.random.seed(1)
-        self._check_loglike_fun(
-            np.array([[0.25, 0.3, 0.35, 0.4]]).T, active_indices)
+
+class TestBayesianOED(unittest.TestCase):
+
+    def setUp(self):
         np.random.seed(1)
+
+    def _check_loglike_fun(self, noise_std, active_indices, design=None,
+                           degree=1):
+        check_loglike_fun(noise_std, active_indices, design, degree)
+
+    def test_gaussian_loglike_fun(self):
+        noise_std = np.array([[0.25, 0.3, 0.35, 0.4]]).T
+        # each check resets the seed so that the checks are reproducible
+        # whether they are run sequentially or in parallel
+        check_args = [
+            (0.3, None, None, 1, 1),
+            (noise_std, None, None, 1, 1)]
+        for active_indices in [np.array([0, 1, 2, 3]), np.array([0, 2, 3])]:
+            check_args += [
+                (0.3, active_indices, None, 1, 1),
+                (noise_std, active_indices, None, 1, 1)]
         # repeated observations at the same design location
-        design = np.array([[-1, -1]])
-        self._check_loglike_fun(
-            np.array([[0.25, 0.25]]).T, [0, 0], design)
+        check_args.append(
+            (np.array([[0.25, 0.25]]).T, [0, 0], np.array([[-1, -1]]), 1, 1))
+        run_loglike_fun_checks(check_args)
 
     def _check_gaussian_loglike_fun_3d(self, noise_std, active_indices):
         nvars = 1
@@ -660,15 +716,25 @@ class TestBayesianOED(unittest.TestCase):
             active_indices)[:, 0]
         assert np.allclose(loglike, loglike_3d)
 
+        # broadcast obs rather than copying it for each sample
+        nsamples = pred_obs.shape[0]
+        loglike_paired = gaussian_loglike_fun(
+            np.broadcast_to(obs, (nsamples, obs.shape[1])), pred_obs,
+            noise_std,
+            active_indices)[:, 0]
+        assert np.allclose(loglike, loglike_paired)
+
         loglike_3d_econ = gaussian_loglike_fun(
-            np.vstack([obs[:, :]]*pred_obs.shape[0]),
+            np.broadcast_to(obs, (nsamples, obs.shape[1])),
             pred_obs[:, None, :], noise_std,
             active_indices)[:, 0]
         assert np.allclose(loglike_3d, loglike_3d_econ)
 
         loglike_3d_econ = gaussian_loglike_fun(
-            np.vstack([obs[:, None, :]]*pred_obs.shape[0]),
-            np.hstack([pred_obs[:, None, :]]*3), noise_std,
+            np.broadcast_to(obs[:, None, :], (nsamples, 1, obs.shape[1])),
+            np.broadcast_to(
+                pred_obs[:, None, :], (nsamples, 3, pred_obs.shape[1])),
+            noise_std,
             active_indices)[:, 0]
         assert np.allclose(loglike_3d, loglike_3d_econ)
 
@@ -905,9 +971,15 @@ class TestBayesianOED(unittest.TestCase):
         kl_divs = np.empty(oed.nout_samples)
         idx = oed.collected_design_indices
         noise_cov_inv_idx = np.eye(idx.shape[0])/noise_std**2
+        # the pairs of noisy and predicted observations are known before the
+        # loop so evaluate all their log-likelihoods with one call
+        out_pred_obs_idx = oed.out_pred_obs[:, idx]
+        all_noisy_obs = (
+            out_pred_obs_idx+oed.noise_samples[:, :idx.shape[0]])
+        loglike_vals = gaussian_loglike_fun(
+            all_noisy_obs, out_pred_obs_idx, noise_std)[:, 0]
         for jj in range(oed.nout_samples):
-            noisy_obs = oed.out_pred_obs[jj:jj+1, idx] +\
-                    oed.noise_samples[jj, :idx.shape[0]]
+            noisy_obs = all_noisy_obs[jj:jj+1]
             post_mean, post_cov = \
                 laplace_posterior_approximation_for_linear_models(
                     Amat[idx], prior_mean, prior_cov_inv,
@@ -919,11 +991,8 @@ class TestBayesianOED(unittest.TestCase):
                     noise_std))[:, 0],
                 lambda y: np.atleast_2d(prior_variable.pdf(y.T)).T,
                 post_cov, post_mean)
-            loglike_val = gaussian_loglike_fun(
-                noisy_obs, oed.out_pred_obs[jj:jj+1, idx],
-                noise_std)[:, 0]
             # kl_divs is not exactly the KL divergence
-            kl_divs[jj] = loglike_val-np.log(gauss_evidence)
+            kl_divs[jj] = loglike_vals[jj]-np.log(gauss_evidence)
         ref_utilities = data_risk_fun(kl_divs[:, None], oed.out_weights)
         # print(ref_utilities, utilities[idx[-1]])
         assert np.allclose(ref_utilities, utilities)
@@ -2013,9 +2082,10 @@ class TestBayesianOED(unittest.TestCase):
             pred_mat, prior_mean, prior_cov, deviation_quantile, nonlinear)
         samples = prior_variable.rvs(int(1e6))
         pred_vals = pred_mat.dot(samples)
-        # print(pred_vals.std(axis=1))
+        # print(_single_pass_std(pred_vals))
         # print(pred_stats[:, 0])
-        assert np.allclose(pred_vals.std(axis=1), pred_stats[:, 0], atol=1e-2)
+        assert np.allclose(
+            _single_pass_std(pred_vals), pred_stats[:, 0], atol=1e-2)
 
         deviation_quantile, nonlinear = 0.9, False
         pred_stats = compute_linear_gaussian_prior_prediction_stats(
@@ -2030,17 +2100,19 @@ class TestBayesianOED(unittest.TestCase):
         deviation_quantile, nonlinear = None, True
         pred_stats = compute_linear_gaussian_prior_prediction_stats(
             pred_mat, prior_mean, prior_cov, deviation_quantile, nonlinear)
+        # reuse the exponentiated values for both nonlinear checks
+        exp_pred_vals = np.exp(pred_vals)
         # print(pred_stats)
-        # print(np.exp(pred_vals).std(axis=1))
+        # print(_single_pass_std(exp_pred_vals))
         # print(pred_stats[:, 0])
         assert np.allclose(
-            np.exp(pred_vals).std(axis=1), pred_stats[:, 0], rtol=1e-2)
+            _single_pass_std(exp_pred_vals), pred_stats[:, 0], rtol=1e-2)
 
         deviation_quantile, nonlinear = 0.9, True
         pred_stats = compute_linear_gaussian_prior_prediction_stats(
             pred_mat, prior_mean, prior_cov, deviation_quantile, nonlinear)
         pred_stats_mc = conditional_value_at_risk_vectorized(
-            np.exp(pred_vals), deviation_quantile)
+            exp_pred_vals, deviation_quantile)
         # print(pred_vals.shape)
         # print(pred_stats[:, 0])
         # print(pred_stats_mc)
@@ -1,6 +1,7 @@
 import warnings
 from abc import abstractmethod
 from functools import partial
+from multiprocessing import Pool
 
 import torch
 import numpy as np
@@ -8,7 +9,7 @@ from scipy.optimize import minimize, Bounds
 
 from pyapprox.util.utilities import get_correlation_from_covariance
 from pyapprox.multifidelity.stats import (
-    MultiOutputVariance, MultiOutputMeanAndVariance)
+    MultiOutputMean, MultiOutputVariance, MultiOutputMeanAndVariance)
 from pyapprox.multifidelity._visualize import (
     _plot_allocation_matrix, _plot_model_recursion)
 from pyapprox.multifidelity._optim import (
@@ -200,7 +201,9 @@ class MCEstimator():
             msg = "cov.shape {0} and costs.shape {1} are inconsistent".format(
                 cov.shape, costs.shape)
             raise ValueError(msg)
-        return (torch.as_tensor(cov, dtype=torch.double).clone(),
+        # cov is never modified by the estimator so share memory with
+        # the covariance stored by stat instead of copying it
+        return (torch.as_tensor(cov, dtype=torch.double),
                 torch.as_tensor(costs, dtype=torch.double),
                 nmodels, cov.shape[0]//nmodels)
 
@@ -294,14 +297,21 @@ class MCEstimator():
             The bootstrap estimate of the estimator covariance
         """
         nbootstraps = int(nbootstraps)
-        estimator_vals = np.empty((nbootstraps, self._stat._nqoi))
         nsamples = values[0].shape[0]
-        indices = np.arange(nsamples)
-        for kk in range(nbootstraps):
-            bootstrapped_indices = np.random.choice(
-                indices, size=nsamples, replace=True)
-            estimator_vals[kk] = self._stat.sample_estimate(
-                values[0][bootstrapped_indices])
+        # draw the indices of all bootstraps at once. This consumes the
+        # random number stream in the same order as drawing them one
+        # bootstrap at a time. randint produces the same indices as
+        # np.random.choice(np.arange(nsamples)) without the extra gather
+        bootstrapped_indices = np.random.randint(
+            0, nsamples, size=(nbootstraps, nsamples))
+        if isinstance(self._stat, MultiOutputMean):
+            # means of all the bootstraps can be computed with one call
+            estimator_vals = values[0][bootstrapped_indices].mean(axis=1)
+        else:
+            estimator_vals = np.empty((nbootstraps, self._stat._nqoi))
+            for kk in range(nbootstraps):
+                estimator_vals[kk] = self._stat.sample_estimate(
+                    values[0][bootstrapped_indices[kk]])
         bootstrap_mean = estimator_vals.mean(axis=0)
         bootstrap_covar = np.cov(estimator_vals, rowvar=False, ddof=1)
         return bootstrap_mean, bootstrap_covar
@@ -722,16 +732,20 @@ class ACVEstimator(CVEstimator):
         to ratios defining the number of samples per mdoel
         relative to the number of highest-fidelity model samples
         """
-        model_ratios = torch.empty_like(partition_ratios, dtype=torch.double)
-        for ii in range(1, self._nmodels):
-            active_partitions = np.where(
-                (self._allocation_mat[1:, 2*ii] == 1) |
-                (self._allocation_mat[1:, 2*ii+1] == 1))[0]
-            model_ratios[ii-1] = partition_ratios[active_partitions].sum()
-            if ((self._allocation_mat[0, 2*ii] == 1) or
-                    (self._allocation_mat[0, 2*ii+1] == 1)):
-                model_ratios[ii-1] += 1
-        return model_ratios
+        return (self._partition_to_model_ratios_mat @ partition_ratios +
+                self._partition_to_model_ratios_shift)
+
+    def _set_partition_to_model_ratios_map(self):
+        # The model ratios are an affine function of the partition ratios
+        # that only depends on the allocation matrix. Store it so
+        # that the objective and constraints, which are evaluated many times
+        # by the optimizer, do not have to search the allocation matrix
+        active = ((self._allocation_mat[:, 2::2] == 1) |
+                  (self._allocation_mat[:, 3::2] == 1))
+        self._partition_to_model_ratios_mat = torch.as_tensor(
+            active[1:].T, dtype=torch.double)
+        self._partition_to_model_ratios_shift = torch.as_tensor(
+            active[0], dtype=torch.double)
 
     def _get_num_high_fidelity_samples_from_partition_ratios(
             self, target_cost, partition_ratios):
@@ -852,25 +866,11 @@ class ACVEstimator(CVEstimator):
             samples_per_model.append(independent_samples[:, indices])
         return samples_per_model
 
-    def _compute_single_model_nsamples(self, npartition_samples, model_id):
-        active_partitions = np.where(
-            (self._allocation_mat[:, 2*model_id] == 1) |
-            (self._allocation_mat[:, 2*model_id+1] == 1))[0]
-        return npartition_samples[active_partitions].sum()
-
-    def _compute_single_model_nsamples_from_partition_ratios(
-            self, partition_ratios, target_cost, model_id):
-        npartition_samples = self._npartition_samples_from_partition_ratios(
-            target_cost, partition_ratios)
-        return self._compute_single_model_nsamples(
-            npartition_samples, model_id)
-
     def _compute_nsamples_per_model(self, npartition_samples):
-        nsamples_per_model = np.empty(self._nmodels)
-        for ii in range(self._nmodels):
-            nsamples_per_model[ii] = self._compute_single_model_nsamples(
-                npartition_samples, ii)
-        return nsamples_per_model
+        # the number of samples of each model is the total size of the
+        # partitions it uses
+        return self._partitions_per_model.dot(
+            np.asarray(npartition_samples, dtype=float))
 
     def _estimate(self, values_per_model, weights, bootstrap=False):
         nmodels = len(values_per_model)
@@ -915,7 +915,7 @@ class ACVEstimator(CVEstimator):
 
     def _get_allocation_matrix(self):
         """return allocation matrix as torch tensor"""
-        return torch.as_tensor(self._allocation_mat, dtype=torch.double)
+        return self._allocation_mat_torch
 
     def _set_recursion_index(self, index):
         """Set the recursion index of the parameterically defined ACV
@@ -937,6 +937,14 @@ class ACVEstimator(CVEstimator):
                 index, self._nmodels-1)
             raise ValueError(msg)
         self._create_allocation_matrix(index)
+        # the allocation matrix is needed every time the objective is
+        # evaluated so only convert it to a tensor when it changes
+        self._allocation_mat_torch = torch.as_tensor(
+            self._allocation_mat, dtype=torch.double)
+        self._set_partition_to_model_ratios_map()
+        self._partitions_per_model = (
+            (self._allocation_mat[:, ::2] == 1) |
+            (self._allocation_mat[:, 1::2] == 1)).T.astype(float)
         self._recursion_index = index
 
     def combine_acv_samples(self, acv_samples):
@@ -1033,35 +1041,36 @@ class ACVEstimator(CVEstimator):
     def _get_specific_constraints(self, target_cost):
         raise NotImplementedError()
 
-    @staticmethod
-    def _constraint_jacobian(constraint_fun, partition_ratios_np, *args):
-        partition_ratios = torch.as_tensor(
-            partition_ratios_np, dtype=torch.double)
-        partition_ratios.requires_grad = True
-        val = constraint_fun(partition_ratios, *args, return_numpy=False)
-        val.backward()
-        jac = partition_ratios.grad.detach().numpy().copy()
-        partition_ratios.grad.zero_()
-        return jac
-
     def _acv_npartition_samples_constraint(
-            self, partition_ratios_np, target_cost, min_nsamples, partition_id,
-            return_numpy=True):
+            self, partition_ratios_np, target_cost, min_nsamples):
+        # return the constraints for all partitions at once so the optimizer
+        # only calls into python once per iteration
         partition_ratios = torch.as_tensor(
             partition_ratios_np, dtype=torch.double)
         nsamples = self._npartition_samples_from_partition_ratios(
-            target_cost, partition_ratios)[partition_id]
-        val = nsamples-min_nsamples
-        if return_numpy:
-            return val.item()
-        return val
+            target_cost, partition_ratios)
+        return (nsamples-min_nsamples).numpy()
 
     def _acv_npartition_samples_constraint_jac(
-            self, partition_ratios_np, target_cost, min_nsamples,
-            partition_id):
-        return self._constraint_jacobian(
-            self._acv_npartition_samples_constraint, partition_ratios_np,
-            target_cost, min_nsamples, partition_id)
+            self, partition_ratios_np, target_cost, min_nsamples):
+        # The partition sizes are [N_0, r*N_0] with
+        # N_0 = target_cost/(c_0+c^T(A r+b)), where A and b define the
+        # model ratios, so the Jacobian has a closed form
+        partition_ratios = np.asarray(partition_ratios_np, dtype=float)
+        costs = self._costs.numpy()
+        dcost_dratios = costs[1:].dot(
+            self._partition_to_model_ratios_mat.numpy())
+        denom = costs[0]+costs[1:].dot(
+            self._partition_to_model_ratios_shift.numpy())+dcost_dratios.dot(
+                partition_ratios)
+        nhf_samples = target_cost/denom
+        dnhf_samples = -nhf_samples/denom*dcost_dratios
+        nratios = partition_ratios.shape[0]
+        jac = np.empty((nratios+1, nratios))
+        jac[0] = dnhf_samples
+        jac[1:] = (nhf_samples*np.eye(nratios) +
+                   partition_ratios[:, None]*dnhf_samples[None, :])
+        return jac
 
     def _npartition_ratios_constaint(self, partition_ratios_np, ratio_id):
         # needs to be positive
@@ -1088,8 +1097,7 @@ class ACVEstimator(CVEstimator):
             {'type': 'ineq',
              'fun': self._acv_npartition_samples_constraint,
              'jac': self._acv_npartition_samples_constraint_jac,
-             'args': (target_cost, partition_min_nsamples, ii)}
-            for ii in range(self._nmodels)]
+             'args': (target_cost, partition_min_nsamples)}]
 
         # Better to enforce this with bounds
         # Ensure ratios are positive
@@ -1191,35 +1199,62 @@ class ACVEstimator(CVEstimator):
     def get_all_recursion_indices(self):
         return _get_acv_recursion_indices(self._nmodels, self._tree_depth)
 
+    def _allocate_samples_for_recursion_index(
+            self, target_cost, optim_options, index):
+        """
+        Optimize the sample allocation of the estimator with a given
+        recursion index.
+
+        Returns
+        -------
+        result : tuple
+            The rounded partition ratios, rounded target cost and
+            optimized criteria. The criteria is infinite if the
+            optimizer failed and failures are allowed.
+        """
+        self._set_recursion_index(index)
+        try:
+            self._allocate_samples_for_single_recursion(
+                target_cost, optim_options)
+        except RuntimeError as e:
+            # typically solver fails because trying to use
+            # uniformative model as a recursive control variate
+            if not self._allow_failures:
+                raise e
+            self._optimized_criteria = torch.as_tensor(
+                np.inf, dtype=torch.double)
+            if optim_options.get("verbosity", 0) > 0:
+                print("Optimizer failed")
+            return None, None, self._optimized_criteria
+        return (self._rounded_partition_ratios, self._rounded_target_cost,
+                self._optimized_criteria)
+
     def _allocate_samples_for_all_recursion_indices(
             self, target_cost, optim_options):
         verbosity = optim_options.get("verbosity", 0)
+        optim_options = optim_options.copy()
+        nprocs = optim_options.pop("nprocs", 1)
+        indices = list(self.get_all_recursion_indices())
+        # the optimization for each recursion index is independent
+        if nprocs > 1:
+            with Pool(nprocs) as pool:
+                results = pool.map(
+                    partial(self._allocate_samples_for_recursion_index,
+                            target_cost, optim_options), indices)
+        else:
+            results = [
+                self._allocate_samples_for_recursion_index(
+                    target_cost, optim_options, index) for index in indices]
         best_criteria = torch.as_tensor(np.inf, dtype=torch.double)
         best_result = None
-        for index in self.get_all_recursion_indices():
-            self._set_recursion_index(index)
-            try:
-                self._allocate_samples_for_single_recursion(
-                    target_cost, optim_options)
-            except RuntimeError as e:
-                # typically solver fails because trying to use
-                # uniformative model as a recursive control variate
-                if not self._allow_failures:
-                    raise e
-                self._optimized_criteria = torch.as_tensor(
-                    np.inf, dtype=torch.double)
-                if verbosity > 0:
-                    print("Optimizer failed")
+        for index, result in zip(indices, results):
             if verbosity > 2:
                 msg = "\t\t Recursion: {0} Objective: best {1}, current {2}".format(
-                    index, best_criteria.item(),
-                    self._optimized_criteria.item())
+                    index, best_criteria.item(), result[2].item())
                 print(msg)
-            if self._optimized_criteria < best_criteria:
-                best_result = [self._rounded_partition_ratios,
-                               self._rounded_target_cost,
-                               self._optimized_criteria, index]
-                best_criteria = self._optimized_criteria
+            if result[2] < best_criteria:
+                best_result = [*result, index]
+                best_criteria = result[2]
         if best_result is None:
             raise RuntimeError("No solutions were found")
         self._set_recursion_index(best_result[3])
@@ -1278,6 +1313,8 @@ class MFMCEstimator(GMFEstimator):
                          opt_criteria=None)
         # The qoi index used to generate the sample allocation
         self._opt_qoi = opt_qoi
+        self._mfmc_allocation_mat = torch.as_tensor(
+            _get_sample_allocation_matrix_mfmc(nmodels), dtype=torch.double)
 
     def _allocate_samples(self, target_cost, optim_options={}):
         # nsample_ratios returned will be listed in according to
@@ -1300,7 +1337,7 @@ class MFMCEstimator(GMFEstimator):
         return partition_ratios
 
     def _get_allocation_matrix(self):
-        return _get_sample_allocation_matrix_mfmc(self._nmodels)
+        return self._mfmc_allocation_mat
 
 
 class MLMCEstimator(GRDEstimator):
@@ -287,8 +287,9 @@ class AETCBLUE():
         best_subset_costs = self._costs[best_subset+1]
         best_subset_groups = get_model_subsets(best_subset.shape[0])
         # print(best_subset_groups)
-        best_subset_group_costs = asarray([
-            best_subset_costs[group].sum() for group in best_subset_groups])
+        best_subset_group_costs = asarray(
+            MLBLUEEstimator._get_model_subset_costs(
+                best_subset_groups, best_subset_costs))
 
         # recorrect for solving exploitation with unit exploit budget
         best_nsamples_per_subset = asarray(best_allocation)
@@ -330,25 +331,31 @@ class AETCBLUE():
 
         nexplore_samples = max_ncovariates+2
         nexplore_samples_prev = 0
+        # _explore_step never requests more samples than the budget allows,
+        # so preallocate storage for all exploration samples and values
+        nmax_samples = max(
+            nexplore_samples, int(total_budget/np.sum(self._costs)))
         while ((nexplore_samples - nexplore_samples_prev > 0)):
             nnew_samples = nexplore_samples-nexplore_samples_prev
             new_samples = self.rvs(nnew_samples)
-            new_values = [
-                model(new_samples) for model in self.models]
+            new_values = np.hstack(
+                [model(new_samples) for model in self.models])
+            # will fail if model does not return ndarray (nsamples, nqoi=1)
+            assert new_values.ndim == 2
             if nexplore_samples_prev == 0:
-                samples = new_samples
-                values = np.hstack(new_values)
-                # will fail if model does not return ndarray (nsamples, nqoi=1)
-                assert values.ndim == 2
-            else:
-                samples = np.hstack((samples, new_samples))
-                values = np.vstack((values, np.hstack(new_values)))
+                samples = np.empty((new_samples.shape[0], nmax_samples))
+                values = np.empty((nmax_samples, new_values.shape[1]))
+            samples[:, nexplore_samples_prev:nexplore_samples] = new_samples
+            values[nexplore_samples_prev:nexplore_samples] = new_values
             nexplore_samples_prev = nexplore_samples
             result = self._explore_step(
-                total_budget, lf_model_subsets, values, alpha, self._reg_blue,
+                total_budget, lf_model_subsets,
+                values[:nexplore_samples_prev], alpha, self._reg_blue,
                 self._constraint_reg)
             nexplore_samples = result[0]
             last_result = result
+        samples = samples[:, :nexplore_samples_prev]
+        values = values[:nexplore_samples_prev]
         return samples, values, last_result  # akil returns result
 
     def exploit(self, result):
@@ -328,13 +328,13 @@ def get_estimator(estimator_types, stat, costs,
     else:
         estimator_type = estimator_types
 
-    if estimator_type not in multioutput_estimators:
+    est_cls = multioutput_estimators.get(estimator_type)
+    if est_cls is None:
         msg = f"Estimator {estimator_type} not supported. "
         msg += f"Must be one of {multioutput_estimators.keys()}"
         raise ValueError(msg)
 
-    return multioutput_estimators[estimator_type](
-        stat, costs, **est_kwargs)
+    return est_cls(stat, costs, **est_kwargs)
 
 
 def _estimate_components(variable, est, funs, ii):
@@ -508,7 +508,10 @@ def compare_estimator_variances(target_costs, estimators, optim_opts={}):
     for est in estimators:
         est_copies = []
         for target_cost in target_costs:
-            est_copy = copy.deepcopy(est)
+            # allocate_samples only reassigns the attributes it sets so a
+            # shallow copy is sufficient and avoids copying the pilot
+            # quantities of the statistic for every target cost
+            est_copy = copy.copy(est)
             est_copy.allocate_samples(
                 target_cost, optim_options=optim_opts)
             est_copies.append(est_copy)
@@ -4,6 +4,7 @@ from itertools import combinations
 import torch
 import numpy as np
 from scipy.optimize import minimize, LinearConstraint, Bounds
+from scipy.linalg import cho_factor, cho_solve
 
 try:
     import cvxpy
@@ -14,7 +15,7 @@ except ImportError:
 
 from pyapprox.surrogates.autogp._torch_wrappers import (
     full, multidot, pinv, solve, hstack, vstack, asarray,
-    eye, log, einsum, floor, copy)
+    eye, log, einsum, floor, copy, cholesky, cholesky_solve)
 from pyapprox.multifidelity.stats import MultiOutputMean
 
 
@@ -28,6 +29,14 @@ def _restriction_matrix(ncols, subset):
     return mat
 
 
+def _subsets_indicator_matrix(nmodels, subsets):
+    # entry (ii, jj) is one if model jj is in subset ii
+    mat = np.zeros((len(subsets), nmodels))
+    for ii, subset in enumerate(subsets):
+        mat[ii, subset] = 1.0
+    return mat
+
+
 def get_model_subsets(nmodels, max_subset_nmodels=None):
     """
     Parameters
@@ -102,9 +111,17 @@ def _grouped_acv_beta(nmodels, Sigma, subsets, R, reg, asketch):
         raise ValueError("asketch has the wrong shape")
 
     # TODO instead of applyint R matrices just collect correct rows and columns
-    beta = multidot((
-        pinv(Sigma), R.T,
-        solve(multidot((R, pinv(Sigma), R.T))+reg_mat, asketch[:, 0])))
+    # Sigma is the largest matrix involved so only compute its
+    # pseudo-inverse once
+    Sigma_inv = pinv(Sigma)
+    psi = multidot((R, Sigma_inv, R.T))+reg_mat
+    # psi is symmetric positive semi-definite so try a Cholesky solve first
+    # and only use a general solve if psi is numerically singular
+    try:
+        psi_inv_asketch = cholesky_solve(cholesky(psi), asketch)[:, 0]
+    except torch.linalg.LinAlgError:
+        psi_inv_asketch = solve(psi, asketch[:, 0])
+    beta = multidot((Sigma_inv, R.T, psi_inv_asketch))
     return beta
 
 
@@ -202,6 +219,8 @@ class GroupACVEstimator():
             # hack because currently autogradients do not works so must
             # use finite difference
             self._obj_jac = False
+        # only used by optimizers that accept second derivatives
+        self._obj_hess = None
 
     def _check_cov(self, cov, costs):
         if cov.shape[0] != len(costs):
@@ -293,8 +312,8 @@ class GroupACVEstimator():
 
     @staticmethod
     def _get_model_subset_costs(subsets, costs):
-        subset_costs = np.array(
-            [costs[subset].sum() for subset in subsets])
+        costs = np.asarray(costs, dtype=float)
+        subset_costs = _subsets_indicator_matrix(len(costs), subsets) @ costs
         return subset_costs
 
     def _cost_constraint(
@@ -496,10 +515,11 @@ class GroupACVEstimator():
                     init_guess, nelder_mead_constraints, init_opts, bounds)
         init_guess = np.maximum(init_guess, self._npartition_samples_lb)
         method = optim_options_copy.pop("method", "trust-constr")
+        hess = self._obj_hess if method == "trust-constr" else None
         # import warnings
         # warnings.filterwarnings("error")
         res = minimize(
-            obj, init_guess, jac=self._obj_jac,
+            obj, init_guess, jac=self._obj_jac, hess=hess,
             method=method, constraints=constraints,
             options=optim_options_copy,
             bounds=self._get_bounds(*bounds))
@@ -707,6 +727,7 @@ class MLBLUEEstimator(GroupACVEstimator):
                 [b.flatten()[:, None] for b in self._psi_blocks])
 
         self._obj_jac = True
+        self._obj_hess = self._objective_hessian
 
     def _compute_psi_blocks(self):
         submats = []
@@ -730,23 +751,40 @@ class MLBLUEEstimator(GroupACVEstimator):
     def _objective(self, npartition_samples_np, return_grad=True):
         # leverage block diagonal structure to compute gradients efficiently
         psi = self._psi_matrix(npartition_samples_np)
+        # psi is symmetric positive definite for feasible sample allocations
+        # so use a Cholesky factorization instead of forming its inverse
         try:
-            psi_inv = np.linalg.inv(psi)
+            psi_chol = cho_factor(psi, lower=True)
         except np.linalg.LinAlgError:
             # sometimes nelder mead tries values that violate constraints
             # so return large value here
             assert not return_grad
             return 9e16
-        variance = np.linalg.multi_dot(
-            (self._asketch.T, psi_inv, self._asketch))
+        asketch = self._asketch.numpy()
+        psi_inv_asketch = cho_solve(psi_chol, asketch)
+        variance = asketch.T.dot(psi_inv_asketch)
         if not return_grad:
             return variance
-        aT_psi_inv = self._asketch.T.numpy().dot(psi_inv)
-        grad = np.array(
-            [-np.linalg.multi_dot((aT_psi_inv, smat, aT_psi_inv.T))[0, 0]
-             for smat in self._psi_blocks])
+        # d(a^T psi^{-1} a)/dn_i = -(psi^{-1}a)^T S_i (psi^{-1}a), where the
+        # blocks S_i are stored flattened in the columns of _psi_blocks_flat
+        grad = -np.outer(psi_inv_asketch, psi_inv_asketch).flatten().dot(
+            self._psi_blocks_flat)
         return variance, grad
 
+    def _objective_hessian(self, npartition_samples_np):
+        # d^2(a^T psi^{-1} a)/dn_idn_j = 2(S_i psi^{-1}a)^T psi^{-1}
+        # (S_j psi^{-1}a)
+        psi_chol = cho_factor(
+            self._psi_matrix(npartition_samples_np), lower=True)
+        psi_inv_asketch = cho_solve(psi_chol, self._asketch.numpy())[:, 0]
+        # column i of blocks_psi_inv_asketch is S_i psi^{-1}a
+        blocks_psi_inv_asketch = np.einsum(
+            "ijk,j->ik", self._psi_blocks_flat.reshape(
+                (self.nmodels, self.nmodels, self.nsubsets)),
+            psi_inv_asketch)
+        return 2*blocks_psi_inv_asketch.T.dot(
+            cho_solve(psi_chol, blocks_psi_inv_asketch))
+
     def _cvxpy_psi(self, nsps_cvxpy):
         Psi = self._psi_blocks_flat@nsps_cvxpy
         Psi = cvxpy.reshape(Psi, (self.nmodels, self.nmodels))
@@ -20,14 +20,10 @@ def _get_nsamples_intersect(allocation_mat, npartition_samples):
         :math:`|z_i^\star\cap\z_j|` when i%2==0 and j%2==1
         :math:`|z_i\cap\z_j|` when i%2==1 and j%2==1
     """
-    nmodels = allocation_mat.shape[0]
-    nsubset_samples = npartition_samples[:, None] * allocation_mat
-    nsamples_intersect = torch.zeros(
-        (2*nmodels, 2*nmodels), dtype=torch.double)
-    for ii in range(2*nmodels):
-        nsamples_intersect[ii] = (
-            nsubset_samples[allocation_mat[:, ii] == 1]).sum(axis=0)
-    return nsamples_intersect
+    allocation_mat = torch.as_tensor(allocation_mat, dtype=torch.double)
+    # entry (i, j) is the total size of the partitions shared by subsets
+    # i and j
+    return allocation_mat.T @ (npartition_samples[:, None]*allocation_mat)
 
 
 def _get_nsamples_subset(allocation_mat, npartition_samples):
@@ -40,43 +36,37 @@ def _get_nsamples_subset(allocation_mat, npartition_samples):
         :math:`z_i, i=0\ldots, M-1`. These are represented by different
         color blocks in the ACV papers figures of sample allocation
     """
-    nmodels = allocation_mat.shape[0]
-    nsamples_subset = torch.zeros((2*nmodels), dtype=torch.double)
-    for ii in range(2*nmodels):
-        nsamples_subset[ii] = \
-            npartition_samples[allocation_mat[:, ii] == 1].sum()
-    return nsamples_subset
+    allocation_mat = torch.as_tensor(allocation_mat, dtype=torch.double)
+    return allocation_mat.T @ npartition_samples
+
+
+def _combine_acv_discrepancy_multipliers(ratios):
+    r"""
+    Combine the sample-size ratios of each pair of subsets
+    :math:`z_0,z_1^\star,z_1,\ldots,z_{M-1}^\star,z_{M-1}` into the
+    matrix and vector of multipliers of the ACV discrepancy covariances.
+
+    The subset :math:`z_0^\star` is always empty so is not included in
+    ratios, i.e. the entry (i, j) of ratios corresponds to the subsets
+    i+1 and j+1 of the allocation matrix
+    """
+    mat = (ratios[1::2, 1::2] - ratios[1::2, 2::2] -
+           ratios[2::2, 1::2] + ratios[2::2, 2::2])
+    vec = ratios[1::2, 0] - ratios[2::2, 0]
+    return mat, vec
 
 
 def _get_acv_mean_discrepancy_covariances_multipliers(
         allocation_mat, npartition_samples):
-    nmodels = allocation_mat.shape[0]
     if np.any(npartition_samples.detach().numpy() < 0):
         raise RuntimeError("An entry in npartition samples was negative")
     nsamples_intersect = _get_nsamples_intersect(
         allocation_mat, npartition_samples)
     nsamples_subset = _get_nsamples_subset(
         allocation_mat, npartition_samples)
-    Gmat = torch.zeros(
-        (nmodels-1, nmodels-1), dtype=torch.double)
-    gvec = torch.zeros((nmodels-1), dtype=torch.double)
-    for ii in range(1, nmodels):
-        gvec[ii-1] = (
-            nsamples_intersect[2*ii, 0+1]/(
-                nsamples_subset[2*ii]*nsamples_subset[0+1]) -
-            nsamples_intersect[2*ii+1, 0+1]/(
-                nsamples_subset[2*ii+1]*nsamples_subset[0+1]))
-        for jj in range(1, nmodels):
-            Gmat[ii-1, jj-1] = (
-                nsamples_intersect[2*ii, 2*jj]/(
-                    nsamples_subset[2*ii]*nsamples_subset[2*jj]) -
-                nsamples_intersect[2*ii, 2*jj+1]/(
-                    nsamples_subset[2*ii]*nsamples_subset[2*jj+1]) -
-                nsamples_intersect[2*ii+1, 2*jj]/(
-                    nsamples_subset[2*ii+1]*nsamples_subset[2*jj]) +
-                nsamples_intersect[2*ii+1, 2*jj+1]/(
-                    nsamples_subset[2*ii+1]*nsamples_subset[2*jj+1]))
-    return Gmat, gvec
+    return _combine_acv_discrepancy_multipliers(
+        nsamples_intersect[1:, 1:]/(
+            nsamples_subset[1:, None]*nsamples_subset[None, 1:]))
 
 
 def _get_acv_variance_discrepancy_covariances_multipliers(
@@ -84,39 +74,16 @@ def _get_acv_variance_discrepancy_covariances_multipliers(
     """
     Compute H from Equation 3.14 of Dixon et al.
     """
-    nmodels = allocation_mat.shape[0]
     if np.any(npartition_samples.detach().numpy() < 0):
         raise RuntimeError("An entry in npartition samples was negative")
     nsamples_intersect = _get_nsamples_intersect(
         allocation_mat, npartition_samples)
     nsamples_subset = _get_nsamples_subset(
         allocation_mat, npartition_samples)
-    Hmat = torch.zeros(
-        (nmodels-1, nmodels-1), dtype=torch.double)
-    hvec = torch.zeros((nmodels-1), dtype=torch.double)
-
-    N0 = nsamples_subset[0+1]
-    for ii in range(1, nmodels):
-        Nis_0 = nsamples_intersect[2*ii, 0+1]  # N_{0\cap i\star}
-        Ni_0 = nsamples_intersect[2*ii+1, 0+1]  # N_{0\cap i}$
-        Nis = nsamples_subset[2*ii]  # N_{i\star}
-        Ni = nsamples_subset[2*ii+1]  # N_{i}
-        hvec[ii-1] = (
-            Nis_0*(Nis_0-1)/(N0*(N0-1)*Nis*(Nis-1)) -
-            Ni_0*(Ni_0-1)/(N0*(N0-1)*Ni*(Ni-1)))
-        for jj in range(1, nmodels):
-            Nis_js = nsamples_intersect[2*ii, 2*jj]  # N_{i\cap j\star}
-            Ni_j = nsamples_intersect[2*ii+1, 2*jj+1]  # N_{i\cap j}$
-            Ni_js = nsamples_intersect[2*ii+1, 2*jj]  # N_{i\cap j\star}
-            Nis_j = nsamples_intersect[2*ii, 2*jj+1]  # N_{i\star\cap j}$
-            Njs = nsamples_subset[2*jj]  # N_{j\star}
-            Nj = nsamples_subset[2*jj+1]  # N_{j}
-            Hmat[ii-1, jj-1] = (
-                Nis_js*(Nis_js-1)/(Nis*(Nis-1)*Njs*(Njs-1)) -
-                Nis_j*(Nis_j-1)/(Nis*(Nis-1)*Nj*(Nj-1)) -
-                Ni_js*(Ni_js-1)/(Ni*(Ni-1)*Njs*(Njs-1)) +
-                Ni_j*(Ni_j-1)/(Ni*(Ni-1)*Nj*(Nj-1)))
-    return Hmat, hvec
+    Nint = nsamples_intersect[1:, 1:]
+    Nsub = nsamples_subset[1:]
+    return _combine_acv_discrepancy_multipliers(
+        Nint*(Nint-1)/((Nsub*(Nsub-1))[:, None]*(Nsub*(Nsub-1))[None, :]))
 
 
 def _get_multioutput_acv_mean_discrepancy_covariances(
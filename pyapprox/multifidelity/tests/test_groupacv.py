@@ -5,7 +5,7 @@ import numpy as np
 from scipy import stats
 
 from pyapprox.util.utilities import (
-    get_correlation_from_covariance, check_gradients)
+    get_correlation_from_covariance, check_gradients, check_hessian)
 from pyapprox.multifidelity.groupacv import (
     get_model_subsets, GroupACVEstimator,
     _get_allocation_matrix_is, _get_allocation_matrix_nested, _nest_subsets,
@@ -240,6 +240,12 @@ class TestGroupACV(unittest.TestCase):
             disp=False)
         assert errors.min()/errors.max() < 1e-6 and errors[0] < 1
 
+        errors = check_hessian(
+            lambda x: mlest._objective(x[:, 0], True)[1],
+            lambda x, p: mlest._objective_hessian(x[:, 0]).dot(p[:, 0]),
+            init_guess[:, None], disp=False)
+        assert errors.min()/errors.max() < 1e-6 and errors[0] < 1
+
         # the answers will be different because group acv optimization
         # currently uses finite differences
         print(gest._optimized_criteria, mlest._optimized_criteria)
@@ -532,6 +532,22 @@ class TestMOMC(unittest.TestCase):
         rtol, atol = 2e-2, 1e-4
         assert np.allclose(covar_mc, covar, atol=atol, rtol=rtol)
 
+    def test_allocate_samples_for_all_recursion_indices_nprocs(self):
+        funs, cov, costs, model, means = _setup_multioutput_model_subproblem(
+            [0, 1, 2], [0])
+        costs = np.array([2, 1.5, 1])
+        target_cost = 50
+        results = []
+        for nprocs in [1, 2]:
+            stat = multioutput_stats["mean"](1)
+            stat.set_pilot_quantities(cov)
+            est = get_estimator("gmf", stat, costs, tree_depth=2)
+            est.allocate_samples(target_cost, {"nprocs": nprocs})
+            results.append(
+                [est._optimized_criteria.item(), est._recursion_index])
+        assert np.allclose(results[0][0], results[1][0])
+        assert np.allclose(results[0][1], results[1][1])
+
     def test_insert_pilot_samples(self):
         # This test is specific to ACV sampling strategies (not yet MLBLUE)
         funs, cov, costs, model, means = _setup_multioutput_model_subproblem(
@@ -1,5 +1,5 @@
 import unittest
-from functools import partial
+from functools import partial, lru_cache
 
 import numpy as np
 
@@ -19,9 +19,16 @@ def _two_qoi(ii, jj, fun, xx):
     return fun(xx)[:, [ii, jj]]
 
 
-def _setup_multioutput_model_subproblem(model_idx, qoi_idx):
+@lru_cache(maxsize=None)
+def _setup_multioutput_model():
+    # the ensemble and its moments do not change between test cases so
+    # only build them once
     model = MultioutputModelEnsemble()
-    cov = model.get_covariance_matrix()
+    return model, model.get_covariance_matrix(), model.get_means()
+
+
+def _setup_multioutput_model_subproblem(model_idx, qoi_idx):
+    model, cov, means = _setup_multioutput_model()
     funs = [model.funs[ii] for ii in model_idx]
     if len(qoi_idx) == 1:
         funs = [partial(_single_qoi, qoi_idx[0], f) for f in funs]
@@ -30,7 +37,7 @@ def _setup_multioutput_model_subproblem(model_idx, qoi_idx):
     idx = np.arange(9).reshape(3, 3)[np.ix_(model_idx, qoi_idx)].flatten()
     cov = cov[np.ix_(idx, idx)]
     costs = model.costs()[model_idx]
-    means = model.get_means()[np.ix_(model_idx, qoi_idx)]
+    means = means[np.ix_(model_idx, qoi_idx)]
     return funs, cov, costs, model, means
 
 
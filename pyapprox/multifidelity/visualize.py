@@ -51,18 +51,19 @@ def plot_estimator_variances(optimized_estimators,
     """
     linestyles = ['-', '--', ':', '-.', (0, (5, 10)), '-']
     nestimators = len(est_labels)
-    est_criteria = []
+    # store the costs and criteria of all estimators in arrays with shape
+    # (nestimators, ntarget_costs)
+    est_total_costs = np.array(
+        [[est._rounded_target_cost for est in optimized_estimators[ii]]
+         for ii in range(nestimators)])*cost_normalization
+    est_criteria = np.array(
+        [[criteria(est._covariance_from_npartition_samples(
+            est._rounded_npartition_samples), est)
+          for est in optimized_estimators[ii]]
+         for ii in range(nestimators)])
+    est_criteria /= est_criteria[relative_id, 0]
     for ii in range(nestimators):
-        est_total_costs = np.array(
-            [est._rounded_target_cost for est in optimized_estimators[ii]])
-        est_criteria.append(np.array(
-            [criteria(est._covariance_from_npartition_samples(
-                est._rounded_npartition_samples), est)
-             for est in optimized_estimators[ii]]))
-    est_total_costs *= cost_normalization
-    for ii in range(nestimators):
-        ax.loglog(est_total_costs,
-                  est_criteria[ii]/est_criteria[relative_id][0],
+        ax.loglog(est_total_costs[ii], est_criteria[ii],
                   label=est_labels[ii], ls=linestyles[ii], marker='o')
     if ylabel is None:
         ylabel = mathrm_label("Estimator variance")
@@ -153,29 +154,32 @@ def plot_estimator_sample_allocation_comparison(
     nestimators = len(estimators)
     xlocs = np.arange(nestimators)
 
-    from matplotlib.pyplot import cm
+    # entry (jj, ii) of cost_ratios is the fraction of the target cost of
+    # estimator jj spent on model ii. Zero when the estimator does not use
+    # that model
+    max_nmodels = max(est._nmodels for est in estimators)
+    nsamples_per_model = np.zeros((nestimators, max_nmodels))
+    cost_ratios = np.zeros((nestimators, max_nmodels))
     for jj, est in enumerate(estimators):
-        cnt = 0
-        # warning currently colors will not match if estimators use different
-        # models
-        colors = cm.rainbow(np.linspace(0, 1, est._nmodels))
-        rects = []
-        est.model_labels = model_labels
-        for ii in range(est._nmodels):
-            if jj == 0:
-                label = est.model_labels[ii]
-            else:
-                label = None
-            cost_ratio = (est._costs[ii]*est._rounded_nsamples_per_model[ii] /
-                          est._rounded_target_cost)
-            rect = ax.bar(
-                xlocs[jj:jj+1], cost_ratio, bottom=cnt, edgecolor='white',
-                label=label, color=colors[ii])
-            rects.append(rect)
-            cnt += cost_ratio
-        _autolabel(ax, rects,
-                   ['$%d$' % int(est._rounded_nsamples_per_model[ii])
-                    for ii in range(est._nmodels)])
+        nsamples_per_model[jj, :est._nmodels] = np.asarray(
+            est._rounded_nsamples_per_model)
+        cost_ratios[jj, :est._nmodels] = (
+            np.asarray(est._costs)*nsamples_per_model[jj, :est._nmodels] /
+            float(est._rounded_target_cost))
+
+    from matplotlib.pyplot import cm
+    # warning currently colors will not match if estimators use different
+    # models
+    colors = cm.rainbow(np.linspace(0, 1, max_nmodels))
+    bottom = np.zeros(nestimators)
+    for ii in range(max_nmodels):
+        rects = ax.bar(
+            xlocs, cost_ratios[:, ii], bottom=bottom, edgecolor='white',
+            label=model_labels[ii], color=colors[ii])
+        used = np.array([ii < est._nmodels for est in estimators])
+        _autolabel(ax, [rect for rect, u in zip(rects, used) if u],
+                   ['$%d$' % int(n) for n in nsamples_per_model[used, ii]])
+        bottom += cost_ratios[:, ii]
     ax.set_xticks(xlocs)
     # number of samples are rounded cost est_rounded cost,
     # but target cost is not rounded
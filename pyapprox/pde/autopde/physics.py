@@ -172,10 +172,9 @@ class AdvectionDiffusionReaction(AbstractSpectralCollocationPhysics):
         vel_vals = vel_fun(mesh.mesh_pts)
         linear_jac = 0
         for dd in range(mesh.nphys_vars):
+            dmat = mesh._dmats[dd]
             linear_jac += (
-                multi_dot(
-                    (mesh._dmats[dd], diff_vals*mesh._dmats[dd])) -
-                vel_vals[:, dd:dd+1]*mesh._dmats[dd])
+                dmat @ (diff_vals*dmat) - vel_vals[:, dd:dd+1]*dmat)
         return linear_jac
 
     @staticmethod
@@ -192,10 +192,11 @@ class SteadyStateAdjointPDE(SteadyStatePDE):
         return self._fwd_solver.physics._residual(sol)[0]
 
     def compute_gradient(self, set_param_values, param_vals, return_obj=False,
-                         **newton_kwargs):
+                         fwd_sol=None, **newton_kwargs):
         # use detach so that fwd_sol is not part of AD-graph
         set_param_values(self._fwd_solver.physics, param_vals.detach())
-        fwd_sol = self._fwd_solver.solve(**newton_kwargs)
+        if fwd_sol is None:
+            fwd_sol = self._fwd_solver.solve(**newton_kwargs)
         adj_sol = self.solve_adjoint(fwd_sol, param_vals.detach())
 
         param_vals_copy = torch.clone(param_vals)
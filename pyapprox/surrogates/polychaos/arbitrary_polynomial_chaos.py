@@ -223,7 +223,8 @@ def compute_moment_matrix_using_tensor_product_quadrature(
         num_samples, num_vars, univariate_quadrature_rule, None,
         density_function)
     basis_matrix = basis_matrix_func(samples)
-    moment_matrix = np.dot(np.diag(np.sqrt(weights)), basis_matrix)
+    # scale rows elementwise instead of forming np.diag(np.sqrt(weights))
+    moment_matrix = np.sqrt(weights)[:, None]*basis_matrix
     return moment_matrix
 
 
@@ -779,7 +779,9 @@ class LeastInterpolationSolver(object):
 def precondition_matrix(pts, precond_weights, matrix):
     if (precond_weights.shape[0] != matrix.shape[0]):
         raise Exception("This should not happen")
-    matrix = np.dot(np.diag(np.sqrt(precond_weights)), matrix)
+    # scale rows without forming a dense diagonal matrix. Use transposes so
+    # that 1D vectors of values are also supported
+    matrix = (np.sqrt(precond_weights)*matrix.T).T
     return matrix
 
 
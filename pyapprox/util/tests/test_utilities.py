@@ -8,10 +8,18 @@ from pyapprox.util.utilities import (
     get_random_k_fold_sample_indices,
     get_cross_validation_rsquared_coefficient_of_variation,
     integrate_using_univariate_gauss_legendre_quadrature_unbounded,
-    split_indices
+    split_indices, check_gradients
 )
 
 
+def _quadratic_fun_with_grad(zz, return_grad=True):
+    # module level so it can be pickled by multiprocessing
+    vals = np.sum(zz**2, axis=0)[:, None]
+    if not return_grad:
+        return vals
+    return vals, 2*zz.T
+
+
 class TestUtilities(unittest.TestCase):
     def setUp(self):
         np.random.seed(1)
@@ -178,6 +186,19 @@ class TestUtilities(unittest.TestCase):
         for test_case in test_cases:
             self._check_split_indices(*test_case)
 
+    def test_check_gradients_nprocs(self):
+        zz = np.random.normal(0, 1, (3, 1))
+        direction = np.random.normal(0, 1, (3, 1))
+        fd_eps = np.logspace(-8, 0, 9)[::-1]
+        errors = check_gradients(
+            _quadratic_fun_with_grad, True, zz, disp=False,
+            direction=direction, fd_eps=fd_eps)
+        assert errors.min()/errors.max() < 1e-6
+        errors_parallel = check_gradients(
+            _quadratic_fun_with_grad, True, zz, disp=False,
+            direction=direction, fd_eps=fd_eps, nprocs=2)
+        assert np.allclose(errors_parallel, errors)
+
 
 if __name__ == "__main__":
     utilities_test_suite = unittest.TestLoader().loadTestsFromTestCase(
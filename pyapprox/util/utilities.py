@@ -1,5 +1,6 @@
 from warnings import warn
 from functools import partial
+from multiprocessing import Pool
 
 import numpy as np
 from numpy.polynomial.legendre import leggauss
@@ -8,8 +9,6 @@ from scipy.special import roots_hermitenorm
 from scipy.linalg import solve_triangular
 from scipy.linalg import lapack
 
-import matplotlib.pyplot as plt
-
 from pyapprox.util.pya_numba import njit
 from pyapprox.util.sys_utilities import hash_array
 from pyapprox.util.sys_utilities import has_kwarg
@@ -939,13 +938,31 @@ def approx_jacobian(func, x, *args, epsilon=np.sqrt(np.finfo(float).eps)):
     return jac.transpose()
 
 
-def _check_gradients(fun, zz, direction, plot, disp, rel, fd_eps):
+def _evaluate_function_without_gradient(fun, jac, zz):
+    # defined at module level so it can be pickled by multiprocessing.Pool
+    return _wrap_function_with_gradient(fun, jac)(zz, direction=None)
+
+
+def _check_gradients(fun, zz, direction, plot, disp, rel, fd_eps,
+                     nprocs=1, perturbed_fun=None):
     function_val, directional_derivative = fun(zz, direction)
     if isinstance(function_val, np.ndarray):
         function_val = function_val.squeeze()
 
     if fd_eps is None:
         fd_eps = np.logspace(-13, 0, 14)[::-1]
+
+    # the perturbed function evaluations are independent so evaluate them
+    # all before computing the errors
+    zz_perturbed = [zz.copy()+eps*direction for eps in fd_eps]
+    if nprocs > 1:
+        with Pool(processes=min(nprocs, len(zz_perturbed))) as pool:
+            perturbed_function_vals = pool.map(perturbed_fun, zz_perturbed)
+    else:
+        # add jac=False so that exact gradient is not always computed
+        perturbed_function_vals = [
+            fun(zz_p, direction=None) for zz_p in zz_perturbed]
+
     errors = []
     row_format = "{:<12} {:<25} {:<25} {:<25}"
     if disp:
@@ -960,10 +977,7 @@ def _check_gradients(fun, zz, direction, plot, disp, rel, fd_eps):
                 "Abs. Errors"))
     row_format = "{:<12.2e} {:<25} {:<25} {:<25}"
     for ii in range(fd_eps.shape[0]):
-        zz_perturbed = zz.copy()+fd_eps[ii]*direction
-        # perturbed_function_val = fun(zz_perturbed)
-        # add jac=False so that exact gradient is not always computed
-        perturbed_function_val = fun(zz_perturbed, direction=None)
+        perturbed_function_val = perturbed_function_vals[ii]
         if isinstance(perturbed_function_val, np.ndarray):
             perturbed_function_val = perturbed_function_val.squeeze()
         # print(inspect.getfullargspec(fun).args)
@@ -985,6 +999,8 @@ def _check_gradients(fun, zz, direction, plot, disp, rel, fd_eps):
                 errors[ii]))
 
     if plot:
+        # only import matplotlib when needed because it is slow to import
+        import matplotlib.pyplot as plt
         plt.loglog(fd_eps, errors, 'o-')
         plt.ylabel(r'$\lvert\nabla_\epsilon f\cdot p-\nabla f\cdot p\rvert$')
         plt.xlabel(r'$\epsilon$')
@@ -1036,7 +1052,7 @@ def _wrap_function_with_gradient(fun, return_grad):
 
 
 def check_gradients(fun, jac, zz, plot=False, disp=True, rel=True,
-                    direction=None, fd_eps=None):
+                    direction=None, fd_eps=None, nprocs=1):
     """
     Compare a user specified jacobian with the jacobian computed with finite
     difference with multiple step sizes.
@@ -1100,6 +1116,10 @@ def check_gradients(fun, jac, zz, plot=False, disp=True, rel=True,
         The finite difference step sizes used to compute the gradient.
         If None then fd_eps=np.logspace(-13, 0, 14)[::-1]
 
+    nprocs : integer
+        The number of processes used to evaluate ``fun`` at the perturbed
+        samples. If greater than one ``fun`` and ``jac`` must be pickleable.
+
     Returns
     -------
     errors : np.ndarray (14, nqoi)
@@ -1116,8 +1136,12 @@ def check_gradients(fun, jac, zz, plot=False, disp=True, rel=True,
         direction /= np.linalg.norm(direction)
     assert direction.ndim == 2 and direction.shape[1] == 1
 
+    perturbed_fun = None
+    if nprocs > 1:
+        perturbed_fun = partial(_evaluate_function_without_gradient, fun, jac)
     return _check_gradients(
-        fun_wrapper, zz, direction, plot, disp, rel, fd_eps)
+        fun_wrapper, zz, direction, plot, disp, rel, fd_eps, nprocs,
+        perturbed_fun)
 
 
 def check_hessian(jac, hessian_matvec, zz, plot=False, disp=True, rel=True,
@@ -1210,6 +1234,8 @@ def check_hessian(jac, hessian_matvec, zz, plot=False, disp=True, rel=True,
             # print(fd_directional_derivative,directional_derivative)
 
     if plot:
+        # only import matplotlib when needed because it is slow to import
+        import matplotlib.pyplot as plt
         plt.loglog(fd_eps, errors, 'o-')
         label = r'$\lvert\nabla^2_\epsilon \cdot p f-\nabla^2 f\cdot p\rvert$'
         plt.ylabel(label)